@@ -7,6 +7,8 @@ import logging
 import time
 from pathlib import Path
 from typing import Dict, List
+
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
 from fastapi.responses import JSONResponse
 
@@ -72,10 +74,8 @@ async def list_documents(
                 documents=[]
             )
 
-        import json
-        with open(metadata_file, 'r') as f:
-            data = json.load(f)
-            metadata = data['metadata']
+        # orjson on raw bytes: C parser, no incremental text decoding
+        metadata = orjson.loads(metadata_file.read_bytes())['metadata']
 
         # Aggregate documents by file_name
         doc_stats: Dict[str, Dict] = {}
@@ -283,7 +283,7 @@ async def reindex_documents(
         # Create new vectorstore
         from langchain_chroma import Chroma
         from langchain_community.embeddings import OllamaEmbeddings
-        from langchain_community.retrievers import BM25Retriever
+        from ..core.bm25 import BM25SRetriever, index_dir_for, remove_stale_indexes
 
         embeddings = OllamaEmbeddings(
             model=config.embedding.model_name,
@@ -301,17 +301,28 @@ async def reindex_documents(
 
         # Rebuild BM25 index
         logger.info("Rebuilding BM25 index...")
-        bm25_retriever = BM25Retriever.from_documents(result.documents)
-
-        # Save chunk metadata for BM25
-        import json
-        metadata_file = config.vector_db_dir / "chunk_metadata.json"
         chunk_data = {
             'texts': [doc.page_content for doc in result.documents],
             'metadata': [doc.metadata for doc in result.documents]
         }
-        with open(metadata_file, 'w') as f:
-            json.dump(chunk_data, f)
+        bm25_retriever = await asyncio.to_thread(
+            BM25SRetriever.from_texts,
+            chunk_data['texts'],
+            chunk_data['metadata']
+        )
+
+        # Save chunk metadata for BM25, then the index under its signature (so
+        # the next startup loads it instead of rebuilding) and drop the indexes
+        # of older metadata. The in-memory retriever is already built, so a
+        # failed save only costs a rebuild on the next startup
+        metadata_file = config.vector_db_dir / "chunk_metadata.json"
+        metadata_file.write_bytes(orjson.dumps(chunk_data))
+        index_dir = index_dir_for(metadata_file)
+        try:
+            bm25_retriever.save(index_dir)
+            remove_stale_indexes(index_dir)
+        except OSError as e:
+            logger.warning(f"Could not save BM25 index: {e}")
 
         logger.info("BM25 index rebuilt")
 
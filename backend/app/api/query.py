@@ -206,8 +206,10 @@ async def query(
             use_context=request.use_context
         )
 
-        # Convert dict result to Pydantic model
-        return QueryResponse(**result)
+        # PERFORMANCE: Return the dict; FastAPI validates it against the
+        # response_model once (building QueryResponse here meant a second
+        # validate + model_dump pass over every source)
+        return result
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -236,7 +238,7 @@ async def query_stream(
 
     Each event contains JSON:
     - `{"type": "token", "content": "..."}` - Generated text token
-    - `{"type": "sources", "content": [...]}` - Retrieved sources
+    - `{"type": "sources", "content": [...]}` - Retrieved sources (sent once ready, interleaved with tokens)
     - `{"type": "metadata", "content": {...}}` - Processing metadata
     - `{"type": "done"}` - Generation complete
 
@@ -0,0 +1,124 @@
+"""
+BM25 keyword retriever backed by bm25s
+"""
+
+import hashlib
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import bm25s
+import Stemmer
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+
+def index_dir_for(metadata_file: Path) -> Path:
+    """
+    Directory for the bm25s index built from `metadata_file`.
+
+    Keyed by a content signature of the chunk metadata, so an index is never
+    reused for a different corpus (mtimes don't survive copies/restores).
+    """
+    with open(metadata_file, 'rb') as f:
+        signature = hashlib.file_digest(f, "sha1").hexdigest()[:16]
+    return metadata_file.with_name(f"bm25s_index_{signature}")
+
+
+def remove_stale_indexes(index_dir: Path):
+    """Delete bm25s indexes for other corpus signatures next to `index_dir`"""
+    for stale in index_dir.parent.glob("bm25s_index_*"):
+        if stale != index_dir and stale.is_dir():
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def _tokenize(texts: List[str], stemmer) -> List[List[str]]:
+    """Lowercase, drop English stopwords and stem (same pipeline for corpus and queries)"""
+    return bm25s.tokenize(
+        texts,
+        stopwords="en",
+        stemmer=stemmer,
+        return_ids=False,
+        show_progress=False
+    )
+
+
+class BM25SRetriever(BaseRetriever):
+    """
+    LangChain retriever over a bm25s sparse index.
+
+    Drop-in for langchain_community's BM25Retriever (same `k` attribute and
+    Document results) but scores with a precomputed sparse matrix instead of
+    rank_bm25's per-query Python loop. Chunk texts and metadata are kept as
+    parallel lists; Documents are only built for the top-k hits.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: Any
+    stemmer: Any
+    texts: List[str]
+    metadatas: List[Dict]
+    k: int = 4
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        **kwargs: Any
+    ) -> "BM25SRetriever":
+        """Tokenize and index a corpus"""
+        stemmer = Stemmer.Stemmer("english")
+        index = bm25s.BM25()
+        index.index(_tokenize(texts, stemmer), show_progress=False)
+        return cls(
+            index=index,
+            stemmer=stemmer,
+            texts=texts,
+            metadatas=metadatas or [{} for _ in texts],
+            **kwargs
+        )
+
+    @classmethod
+    def load(
+        cls,
+        index_dir: Path,
+        texts: List[str],
+        metadatas: List[Dict],
+        **kwargs: Any
+    ) -> "BM25SRetriever":
+        """Load an index written by save(); the score matrix is memory-mapped"""
+        return cls(
+            index=bm25s.BM25.load(str(index_dir), mmap=True),
+            stemmer=Stemmer.Stemmer("english"),
+            texts=texts,
+            metadatas=metadatas,
+            **kwargs
+        )
+
+    def save(self, index_dir: Path):
+        """Persist the index (not the corpus, which lives in chunk_metadata.json)"""
+        self.index.save(str(index_dir))
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        k = min(self.k, len(self.texts))
+        if k <= 0:
+            return []
+
+        indices, _ = self.index.retrieve(
+            _tokenize([query], self.stemmer),
+            k=k,
+            show_progress=False
+        )
+        return [
+            Document(page_content=self.texts[i], metadata=self.metadatas[i])
+            for i in indices[0]
+        ]
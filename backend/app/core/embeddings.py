@@ -0,0 +1,87 @@
+"""
+Embedding model wrappers used by the RAG engine
+"""
+
+import functools
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    LangChain Embeddings shim over a SentenceTransformer model.
+
+    Calls model.encode() directly with an explicit batch size, optionally in
+    reduced precision: fp16 on CUDA (tensor-core matmuls) or bf16 on CPU
+    (half the memory bandwidth of fp32). Vectors come back as float32 and are
+    L2-normalized here in float32, so the reduction doesn't accumulate
+    half-precision rounding error.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cpu",
+        batch_size: int = 32,
+        normalize: bool = False,
+        dtype: Optional[object] = None
+    ):
+        """
+        Args:
+            model_name: HuggingFace model id or local path
+            device: 'cuda' or 'cpu'
+            batch_size: encode() batch size
+            normalize: L2-normalize output vectors
+            dtype: torch dtype for the weights (e.g. torch.float16), None for fp32
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device=device)
+        if dtype is not None:
+            self.model.to(dtype)
+        self.batch_size = batch_size
+        self.normalize = normalize
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=False
+        ).astype(np.float32, copy=False)
+        if self.normalize and vectors.size:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.maximum(norms, 1e-12)
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class QueryCachingEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that memoizes embed_query in-process (LRU).
+
+    The same question is embedded by several consumers per request (semantic
+    cache lookup, Chroma dense search, confidence scoring); with this wrapper
+    only the first pays the encoder forward pass. embed_documents is passed
+    through uncached.
+    """
+
+    def __init__(self, inner: Embeddings, maxsize: int = 1024):
+        self.inner = inner
+        self._cached_query = functools.lru_cache(maxsize=maxsize)(self._embed_query_tuple)
+
+    def _embed_query_tuple(self, text: str) -> tuple:
+        return tuple(self.inner.embed_query(text))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        # Stored as an immutable tuple; each caller gets its own list
+        return list(self._cached_query(text))
+
@@ -0,0 +1,80 @@
+"""
+In-process semantic index from query embeddings to query-cache keys
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+def standalone_question(question: str, enhanced_query: str) -> Optional[str]:
+    """
+    Text to embed for the index, or None if the query must not use it.
+
+    Only standalone questions take part, embedded and keyed as asked. A
+    contextualized follow-up's enhanced text is mostly the earlier turns,
+    so it would sit close to them (and to every other follow-up in the same
+    conversation) regardless of what was actually asked.
+    """
+    return question if enhanced_query == question else None
+
+
+class SemanticQueryIndex:
+    """
+    Nearest-neighbour lookup over recently answered queries.
+
+    Holds L2-normalized query vectors in a fixed-size ring buffer (oldest
+    entries are overwritten) and finds the closest one by inner product,
+    i.e. cosine similarity. A match at or above `threshold` returns the
+    cache key the earlier answer was stored under, so a paraphrase can be
+    served from the query cache instead of re-running retrieval and the LLM.
+
+    Brute-force search over a few thousand rows is a single BLAS matvec, so
+    no ANN library is needed at this size. Thread-safe.
+    """
+
+    def __init__(self, threshold: float = 0.92, capacity: int = 4096):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: list = [None] * capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def search(self, vector) -> Optional[str]:
+        """Cache key of the most similar stored query, if similar enough"""
+        query = self._normalize(vector)
+        with self._lock:
+            if not self._size or self._vectors.shape[1] != query.shape[0]:
+                return None
+            similarities = self._vectors[:self._size] @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return self._keys[best]
+
+    def add(self, vector, key: str):
+        """Remember that `key` answers the query embedded as `vector`"""
+        row = self._normalize(vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != row.shape[0]:
+                # First entry, or the embedding model changed: start over
+                self._vectors = np.empty((self.capacity, row.shape[0]), dtype=np.float32)
+                self._size = 0
+                self._next = 0
+            self._vectors[self._next] = row
+            self._keys[self._next] = key
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._size = 0
+            self._next = 0
@@ -4,12 +4,23 @@ CRITICAL: This does NOT modify existing code, only imports and wraps it
 """
 
 import asyncio
+import functools
 import logging
+import mmap
 import os
+import re
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
+
+import msgpack
+import numpy as np
+import orjson
 
 # Initialize logger FIRST (needed for import error handling)
 logger = logging.getLogger(__name__)
@@ -38,15 +49,17 @@ except ImportError as e:
 
 from confidence_scoring import ConfidenceScorer
 
-# LangChain imports
-from langchain_chroma import Chroma
-from langchain_ollama import OllamaLLM  # Updated to use new langchain-ollama package
-from langchain_community.embeddings import OllamaEmbeddings, HuggingFaceEmbeddings
-from langchain_community.retrievers import BM25Retriever
-from langchain.docstore.document import Document
+# LangChain imports: heavy modules (langchain_community, langchain_chroma) are
+# imported lazily where used, since only one backend of each kind is active
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_ollama import OllamaLLM
+    from langchain_community.embeddings import OllamaEmbeddings
+    from .bm25 import BM25SRetriever
 
 # Import timing utilities
 from ..utils.timing import StageTimer
+from .query_index import SemanticQueryIndex, standalone_question
 
 
 class RAGEngine:
@@ -63,6 +76,18 @@ class RAGEngine:
     - Handles caching transparently
     """
 
+    # Fixed attribute layout: faster attribute access on the query hot path
+    __slots__ = (
+        'config', '_cache_key_ctx',
+        'vectorstore', 'bm25_retriever', 'llm', 'embeddings', 'embedding_cache',
+        '_inflight_retrievals', '_query_index',
+        'retrieval_engine', 'answer_generator', 'collection_metadata', 'confidence_scorer',
+        '_init_executor', '_embed_pool', '_io_pool', '_metadata_task',
+        'cache_manager', 'conversation_memory', '_pending_writes',
+        'initialized', 'runtime_settings', 'current_mode', '_sources_pool',
+        'query_count', 'start_time',
+    )
+
     # Default settings (ENHANCED for better recall)
     DEFAULT_SETTINGS = {
         'simple_k': 7,  # INCREASED from 5 for better recall
@@ -74,6 +99,50 @@ class RAGEngine:
         'rrf_constant': 60
     }
 
+    # (max_sources, max_chunk_length) for the streaming prompt, per query type
+    CONTEXT_LIMITS = {
+        "simple": (3, 300),
+        "moderate": (5, 400),
+    }
+    DEFAULT_CONTEXT_LIMITS = (5, 400)
+
+    # Streaming prompt skeletons, filled with (context, question)
+    STREAM_PROMPTS = {
+        "simple": "Answer from sources. Be brief.\n\n%s\n\nQ: %s\nA:",
+        "moderate": "Answer from sources below. Cite [number].\n\n%s\n\nQ: %s\nA:",
+    }
+    DEFAULT_STREAM_PROMPT = "Answer comprehensively from sources. Cite [number].\n\n%s\n\nQ: %s\nA:"
+
+    # Min cosine similarity for a semantic query-cache hit (see SemanticQueryIndex)
+    SEMANTIC_QUERY_THRESHOLD = 0.92
+
+    # In-process LRU of query embeddings (see QueryCachingEmbeddings)
+    QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+    # Token stream coalescing: flush once this many chars or seconds accumulate
+    STREAM_FLUSH_CHARS = 24
+    STREAM_FLUSH_INTERVAL_S = 0.02
+
+    # Slice size when replaying a cached answer over the stream
+    CACHED_STREAM_CHUNK_CHARS = 64
+
+    # Max number of recycled source lists kept for _format_sources
+    SOURCES_POOL_SIZE = 32
+
+    # Conversational filler answered directly (no retrieval, no LLM call)
+    # Only consulted for very short questions in simple mode
+    TRIVIAL_MAX_LENGTH = 32
+    TRIVIAL_RESPONSES = (
+        (re.compile(r"^(hi|hello|hey|greetings|good (morning|afternoon|evening))[\s!.]*$", re.IGNORECASE),
+         "Hello! Ask me a question about your documents."),
+        (re.compile(r"^(thanks|thank you|thx|ty)( very much| so much)?[\s!.]*$", re.IGNORECASE),
+         "You're welcome! Let me know if you have another question."),
+        (re.compile(r"^(bye|goodbye|see you|see ya)[\s!.]*$", re.IGNORECASE),
+         "Goodbye!"),
+        (re.compile(r"^(ok|okay|cool|great|got it|nice)[\s!.]*$", re.IGNORECASE),
+         "Glad to help. Anything else you'd like to know?"),
+    )
+
     def __init__(self, config: Optional[SystemConfig] = None):
         """
         Initialize RAG Engine wrapper.
@@ -83,11 +152,14 @@ class RAGEngine:
         """
         self.config = config or load_config()
 
+        # Shared cache-key context, built once (replaced wholesale on hot-swap)
+        self._cache_key_ctx = {"model": self.config.llm.model_name}
+
         # Core components (initialized in async initialize())
-        self.vectorstore: Optional[Chroma] = None
-        self.bm25_retriever: Optional[BM25Retriever] = None
-        self.llm: Optional[OllamaLLM] = None
-        self.embeddings: Optional[OllamaEmbeddings] = None
+        self.vectorstore: Optional["Chroma"] = None
+        self.bm25_retriever: Optional["BM25SRetriever"] = None
+        self.llm: Optional["OllamaLLM"] = None
+        self.embeddings: Optional["OllamaEmbeddings"] = None
         self.embedding_cache: Optional[EmbeddingCache] = None
 
         # RAG engines
@@ -96,18 +168,41 @@ class RAGEngine:
         self.collection_metadata: Optional[CollectionMetadata] = None
         self.confidence_scorer: Optional[ConfidenceScorer] = None
 
+        # Startup-only thread pool (alive during initialize())
+        self._init_executor: Optional[ThreadPoolExecutor] = None
+
+        # Request-time pools: embedding forwards get their own workers so they
+        # don't queue behind (or block) the general to_thread traffic
+        self._embed_pool: Optional[ThreadPoolExecutor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+
+        # Background collection-metadata recompute (see _recompute_metadata_background)
+        self._metadata_task: Optional[asyncio.Task] = None
+
+        # Query-embedding -> cache-key index for paraphrased/follow-up cache hits
+        self._query_index = SemanticQueryIndex(threshold=self.SEMANTIC_QUERY_THRESHOLD)
+
+        # In-flight simple retrievals keyed by (query, original_query)
+        self._inflight_retrievals: Dict[Tuple[str, Optional[str]], asyncio.Task] = {}
+
         # Infrastructure
         self.cache_manager: Optional[NextGenCacheManager] = None
         self.conversation_memory: Optional[ConversationMemory] = None
 
+        # In-flight cache/memory write-backs (drained by shutdown())
+        self._pending_writes: set = set()
+
         # State
         self.initialized = False
         self.runtime_settings = self.DEFAULT_SETTINGS.copy()
         self.current_mode = "simple"  # Default mode
 
+        # Recycled list buffers for _format_sources (see _release_sources)
+        self._sources_pool: deque = deque(maxlen=self.SOURCES_POOL_SIZE)
+
         # Statistics
         self.query_count = 0
-        self.start_time = datetime.now()
+        self.start_time = time.monotonic()  # Uptime reference (immune to wall-clock jumps)
 
         logger.info("RAGEngine wrapper created")
 
@@ -121,19 +216,40 @@ class RAGEngine:
         Returns:
             Tuple of (success: bool, message: str)
         """
+        # Dedicated pool for startup loads so they don't occupy the default
+        # executor that request handlers use via asyncio.to_thread
+        self._init_executor = ThreadPoolExecutor(
+            max_workers=4,
+            thread_name_prefix="rag-init"
+        )
+
+        # Larger default executor for asyncio.to_thread (cache, memory, Chroma
+        # calls): these block on I/O, so scale with cores past the stdlib's
+        # min(32, cpu + 4). set_default_executor() doesn't shut down the
+        # executor it replaces, so release any the loop already created
+        loop = asyncio.get_running_loop()
+        previous_executor = getattr(loop, "_default_executor", None)
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("THREAD_POOL_SIZE", min(64, (os.cpu_count() or 1) * 8))),
+            thread_name_prefix="rag-io"
+        )
+        loop.set_default_executor(self._io_pool)
+        if previous_executor is not None:
+            previous_executor.shutdown(wait=False)
+
         try:
-            logger.info("=" * 60)
             logger.info("INITIALIZING RAG ENGINE (PARALLEL MODE)")
-            logger.info("=" * 60)
+
+            # Component readiness is collected here and logged once per group
+            # (warnings/errors are still logged immediately)
+            startup_events: List[str] = []
 
             # ============================================================
             # PARALLEL GROUP 1: Independent components (run concurrently)
             # ============================================================
-            logger.info("\n[PARALLEL GROUP 1] Loading independent components...")
 
             async def init_embedding_cache():
                 """Initialize embedding cache"""
-                logger.info("  → Connecting to Redis cache...")
                 redis_url = f"redis://{self.config.cache.redis_host}:{self.config.cache.redis_port}"
                 cache = EmbeddingCache(
                     redis_url=redis_url,
@@ -141,52 +257,92 @@ class RAGEngine:
                     key_prefix="emb:v1:"
                 )
                 await cache.connect()
-                logger.info(f"  ✓ Redis cache connected")
+                startup_events.append("redis_cache")
                 return cache
 
             async def init_embeddings():
                 """Initialize embedding model"""
-                logger.info("  → Loading embedding model...")
-                logger.info(f"     Model: {self.config.embedding.model_name}")
+                from .embeddings import QueryCachingEmbeddings
+                details = [self.config.embedding.model_name]
 
                 if self.config.embedding.model_type == "huggingface":
                     import torch
+                    from .embeddings import SentenceTransformerEmbeddings
                     device = 'cuda' if torch.cuda.is_available() else 'cpu'
-                    logger.info(f"     Device: {device}")
+                    details.append(device)
+
+                    # Encoder forward passes this engine issues itself (the semantic cache
+                    # lookup) run here, not on the shared to_thread pool. One call at a time
+                    # by default: serializes GPU launches, and on CPU each call already
+                    # spreads across all intra-op threads
+                    self._embed_pool = ThreadPoolExecutor(
+                        max_workers=int(os.getenv("EMBED_POOL_SIZE", 1)),
+                        thread_name_prefix="rag-embed"
+                    )
 
-                    embeddings = HuggingFaceEmbeddings(
+                    if device == 'cpu':
+                        # Pin intra-op threads before the model loads (avoids oversubscription)
+                        torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS", os.cpu_count() or 1)))
+
+                    # Reduced-precision weights: fp16 on GPU (tensor cores); bf16 on CPU only
+                    # on request (EMBEDDING_BF16=1) and only with native support
+                    # (AVX512-BF16/AMX), since emulated bf16 matmuls are slower than fp32 and
+                    # query vectors drift from the fp32-built corpus. Output is normalized
+                    # in fp32 either way
+                    dtype = None
+                    if device == 'cuda' and os.getenv("EMBEDDING_FP16", "1") == "1":
+                        dtype = torch.float16
+                    elif device == 'cpu' and os.getenv("EMBEDDING_BF16", "0") == "1":
+                        try:
+                            bf16_native = torch.ops.mkldnn._is_mkldnn_bf16_supported()
+                        except (AttributeError, RuntimeError):
+                            bf16_native = False
+                        if bf16_native:
+                            dtype = torch.bfloat16
+                        else:
+                            logger.warning("  ⚠ EMBEDDING_BF16=1 ignored: CPU lacks native bf16, using fp32")
+                    details.append(str(dtype or torch.float32).replace("torch.", ""))
+
+                    embeddings = await self._run_init(
+                        SentenceTransformerEmbeddings,
                         model_name=self.config.embedding.model_name,
-                        model_kwargs={'device': device},
-                        encode_kwargs={
-                            'normalize_embeddings': self.config.embedding.normalize_embeddings,
-                            'batch_size': self.config.embedding.batch_size
-                        }
+                        device=device,
+                        batch_size=self.config.embedding.batch_size,
+                        normalize=self.config.embedding.normalize_embeddings,
+                        dtype=dtype
                     )
                 else:
+                    from langchain_community.embeddings import OllamaEmbeddings
                     embeddings = OllamaEmbeddings(
                         model=self.config.embedding.model_name,
                         base_url=self.config.ollama_host
                     )
 
-                # Test embeddings
-                test_embed = await asyncio.to_thread(
-                    embeddings.embed_query,
-                    "test"
+                # Share query vectors between the cache manager, Chroma and the scorer
+                embeddings = QueryCachingEmbeddings(
+                    embeddings,
+                    maxsize=self.QUERY_EMBEDDING_CACHE_SIZE
                 )
-                logger.info(f"  ✓ Embeddings ready (dim: {len(test_embed)})")
+
+                # Warm up at full batch size (tokenizer, BLAS pools, pooling kernels)
+                # so the first real query doesn't pay the cold-start cost
+                warmup_embeds = await self._run_init(
+                    embeddings.embed_documents,
+                    ["warmup"] * max(1, self.config.embedding.batch_size)
+                )
+                details.append(f"dim {len(warmup_embeds[0])}")
+                startup_events.append(f"embeddings ({', '.join(details)})")
                 return embeddings
 
             async def load_bm25_data():
                 """Load BM25 metadata file"""
-                logger.info("  → Loading BM25 metadata...")
                 metadata_file = self.config.vector_db_dir / "chunk_metadata.json"
 
                 if metadata_file.exists():
-                    import json
-                    data = await asyncio.to_thread(
-                        lambda: json.load(open(metadata_file, 'r'))
+                    data = await self._run_init(
+                        self._read_bm25_metadata, metadata_file
                     )
-                    logger.info(f"  ✓ BM25 metadata loaded ({len(data['texts'])} chunks)")
+                    startup_events.append(f"bm25_metadata ({len(data['texts'])} chunks)")
                     return data
                 else:
                     logger.warning("  ⚠ BM25 metadata not found")
@@ -194,144 +350,135 @@ class RAGEngine:
 
             async def init_llm():
                 """Initialize LLM client"""
-                logger.info("  → Creating LLM client...")
-                llm = await asyncio.to_thread(
+                llm = await self._run_init(
                     create_llm, self.config, False
                 )
-                logger.info("  ✓ LLM client created")
+                startup_events.append("llm_client")
                 return llm
 
-            # Run Group 1 in parallel
-            results = await asyncio.gather(
-                init_embedding_cache(),
-                init_embeddings(),
-                load_bm25_data(),
-                init_llm(),
-                return_exceptions=True
-            )
-
-            # Unpack results (with error handling)
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Parallel init failed for component {i}: {result}")
-                    raise result
+            # Run Group 1 in parallel (first failure cancels the siblings)
+            async with self._init_group("GROUP 1") as tg:
+                cache_task = tg.create_task(init_embedding_cache())
+                embeddings_task = tg.create_task(init_embeddings())
+                bm25_data_task = tg.create_task(load_bm25_data())
+                llm_task = tg.create_task(init_llm())
 
-            self.embedding_cache, self.embeddings, bm25_data, self.llm = results
-            logger.info("[GROUP 1] ✓ All independent components loaded")
+            self.embedding_cache = cache_task.result()
+            self.embeddings = embeddings_task.result()
+            bm25_data = bm25_data_task.result()
+            self.llm = llm_task.result()
+            logger.info("[GROUP 1] ✓ Loaded: %s", ", ".join(startup_events))
+            startup_events.clear()
 
             # ============================================================
             # PARALLEL GROUP 2: Components that depend on Group 1
             # ============================================================
-            logger.info("\n[PARALLEL GROUP 2] Loading dependent components...")
 
             async def init_cache_manager():
                 """Initialize cache manager (needs embeddings)"""
-                logger.info("  → Initializing cache system...")
-
-                def embed_for_cache(text: str) -> List[float]:
-                    return self.embeddings.embed_query(text)
 
+                # Bound method: no wrapper frame on semantic-cache embedding lookups
                 cache_manager = NextGenCacheManager(
                     self.config,
-                    embeddings_func=embed_for_cache
+                    embeddings_func=self.embeddings.embed_query
                 )
-                logger.info("  ✓ Cache system ready")
+                startup_events.append("cache_manager")
                 return cache_manager
 
             async def init_vectorstore():
                 """Initialize vectorstore (needs embeddings)"""
-                logger.info("  → Loading vector database...")
+                from langchain_chroma import Chroma
 
                 if not self.config.vector_db_dir.exists():
                     raise FileNotFoundError(f"Vector database not found at {self.config.vector_db_dir}")
 
-                vectorstore = await asyncio.to_thread(
+                vectorstore = await self._run_init(
                     Chroma,
                     persist_directory=str(self.config.vector_db_dir),
                     embedding_function=self.embeddings
                 )
-                logger.info("  ✓ Vector store loaded")
+                startup_events.append("vectorstore")
                 return vectorstore
 
             async def init_bm25_retriever(data):
                 """Initialize BM25 retriever (needs BM25 data)"""
-                logger.info("  → Building BM25 retriever...")
-
                 if data:
-                    texts = data['texts']
-                    metadata = data['metadata']
-                    bm25_docs = [
-                        Document(page_content=text, metadata=meta)
-                        for text, meta in zip(texts, metadata)
-                    ]
-                    retriever = await asyncio.to_thread(
-                        BM25Retriever.from_documents, bm25_docs
+                    # Persisted bm25s index, or built from the parallel lists (no Document list)
+                    retriever = await self._run_init(
+                        self._build_bm25_retriever,
+                        data['texts'],
+                        data['metadata'],
+                        self.config.vector_db_dir / "chunk_metadata.json"
                     )
                     retriever.k = self.config.retrieval.initial_k
-                    logger.info(f"  ✓ BM25 ready")
+                    startup_events.append("bm25_retriever")
                 else:
-                    logger.warning("  ⚠ Using dummy BM25 retriever")
-                    retriever = BM25Retriever.from_documents([
-                        Document(page_content="dummy")
-                    ])
+                    # No corpus to index: leave BM25 offline (queries fall back to dense-only)
+                    logger.warning("  ⚠ BM25 retriever offline (dense-only retrieval)")
+                    retriever = None
                 return retriever
 
             async def warmup_llm():
                 """Warm up LLM model (needs LLM client)"""
-                logger.info("  → Warming up LLM model...")
-                logger.info("     This loads the model into VRAM (15-45s, one-time cost)")
+                # Loads the model into VRAM (15-45s, one-time cost)
 
-                warmup_start = asyncio.get_event_loop().time()
+                warmup_start = time.perf_counter()
                 try:
-                    await asyncio.to_thread(
-                        self.llm.invoke,
-                        "Hi"  # Minimal prompt
-                    )
-                    warmup_time = (asyncio.get_event_loop().time() - warmup_start) * 1000
-                    logger.info(f"  ✓ LLM warmed up in {warmup_time/1000:.1f}s")
+                    # Async client: the one query_stream's astream uses, so this also
+                    # opens its pooled keep-alive connection before the first query
+                    await self.llm.ainvoke("Hi")  # Minimal prompt
+                    warmup_time = (time.perf_counter() - warmup_start) * 1000
+                    startup_events.append(f"llm_warmup ({warmup_time/1000:.1f}s)")
                     return True
                 except Exception as e:
                     logger.warning(f"  ⚠ LLM warm-up failed: {e}")
                     return False
 
             # Run Group 2 in parallel
-            results = await asyncio.gather(
-                init_cache_manager(),
-                init_vectorstore(),
-                init_bm25_retriever(bm25_data),
-                warmup_llm(),
-                return_exceptions=True
-            )
-
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Parallel init failed for component {i}: {result}")
-                    raise result
-
-            self.cache_manager, self.vectorstore, self.bm25_retriever, _ = results
-            logger.info("[GROUP 2] ✓ All dependent components loaded")
+            async with self._init_group("GROUP 2") as tg:
+                cache_manager_task = tg.create_task(init_cache_manager())
+                vectorstore_task = tg.create_task(init_vectorstore())
+                bm25_task = tg.create_task(init_bm25_retriever(bm25_data))
+                tg.create_task(warmup_llm())
+
+            self.cache_manager = cache_manager_task.result()
+            self.vectorstore = vectorstore_task.result()
+            self.bm25_retriever = bm25_task.result()
+            logger.info("[GROUP 2] ✓ Loaded: %s", ", ".join(startup_events))
+            startup_events.clear()
 
             # ============================================================
             # PARALLEL GROUP 3: Components needing vectorstore + LLM
             # ============================================================
-            logger.info("\n[PARALLEL GROUP 3] Loading final components...")
+            metadata_recompute_path: Optional[Path] = None
 
             async def init_metadata():
-                """Initialize collection metadata (needs vectorstore + embeddings)"""
-                logger.info("  → Initializing collection metadata...")
-                try:
-                    from pathlib import Path as PathLib
-                    metadata_path = PathLib(self.config.scope_detection.metadata_path)
+                """
+                Initialize collection metadata (needs vectorstore + embeddings)
+
+                Only the cached file is loaded inline; a full recompute (first boot
+                or force_recompute) runs in the background so it doesn't block
+                readiness. Scope detection works without metadata until it lands.
+                """
+                nonlocal metadata_recompute_path
+                metadata_path = Path(self.config.scope_detection.metadata_path)
+
+                if self.config.scope_detection.force_recompute or not metadata_path.exists():
+                    # Started once the answer generator exists (see end of Group 3)
+                    metadata_recompute_path = metadata_path
+                    startup_events.append("collection_metadata (deferred)")
+                    return None
 
-                    metadata = await asyncio.to_thread(
+                try:
+                    metadata = await self._run_init(
                         CollectionMetadata.load_or_compute,
                         vectorstore=self.vectorstore,
                         embeddings=self.embeddings,
                         llm=None,
                         metadata_path=metadata_path,
-                        force_recompute=self.config.scope_detection.force_recompute
+                        force_recompute=False
                     )
-                    logger.info("  ✓ Collection metadata ready")
+                    startup_events.append("collection_metadata")
                     return metadata
                 except Exception as e:
                     logger.warning(f"  ⚠ Metadata init skipped: {e}")
@@ -339,66 +486,74 @@ class RAGEngine:
 
             async def init_conversation_memory():
                 """Initialize conversation memory (needs LLM)"""
-                logger.info("  → Initializing conversation memory...")
                 memory = ConversationMemory(
                     llm=self.llm,
                     max_exchanges=10,
                     summarization_threshold=5,
                     enable_summarization=True
                 )
-                logger.info("  ✓ Conversation memory ready")
+                startup_events.append("conversation_memory")
                 return memory
 
             async def init_confidence_scorer():
                 """Initialize confidence scorer (needs embeddings)"""
-                logger.info("  → Initializing confidence scorer...")
                 try:
                     scorer = ConfidenceScorer(embeddings=self.embeddings)
-                    logger.info("  ✓ Confidence scorer ready")
+                    startup_events.append("confidence_scorer")
                     return scorer
                 except Exception as e:
                     logger.warning(f"  ⚠ Confidence scorer failed: {e}")
                     return None
 
-            # Run Group 3 in parallel
-            results = await asyncio.gather(
-                init_metadata(),
-                init_conversation_memory(),
-                init_confidence_scorer(),
-                return_exceptions=True
-            )
-
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Parallel init failed for component {i}: {result}")
-                    raise result
-
-            self.collection_metadata, self.conversation_memory, self.confidence_scorer = results
-            logger.info("[GROUP 3] ✓ Final components loaded")
+            async def init_retrieval_engine():
+                """Initialize adaptive retriever (needs vectorstore + BM25 + LLM)"""
+                retriever = await self._run_init(
+                    AdaptiveRetriever,
+                    vectorstore=self.vectorstore,
+                    bm25_retriever=self.bm25_retriever,
+                    llm=self.llm,
+                    config=self.config,
+                    runtime_settings=self.runtime_settings
+                )
+                startup_events.append("retrieval_engine")
+                return retriever
 
-            # ============================================================
-            # SEQUENTIAL: Retrieval engines (need everything)
-            # ============================================================
-            logger.info("\n[FINAL] Initializing retrieval engines...")
-            self.retrieval_engine = AdaptiveRetriever(
-                vectorstore=self.vectorstore,
-                bm25_retriever=self.bm25_retriever,
-                llm=self.llm,
-                config=self.config,
-                runtime_settings=self.runtime_settings
-            )
-            self.answer_generator = AdaptiveAnswerGenerator(
-                llm=self.llm,
-                embeddings=self.embeddings,
-                collection_metadata=self.collection_metadata,
-                scope_config=self.config.scope_detection
-            )
-            logger.info("✓ Retrieval engines ready")
+            async def init_answer_generator(metadata_task: asyncio.Task):
+                """Initialize answer generator (needs LLM + embeddings + metadata)"""
+                # Waits only on metadata, overlapping with the rest of Group 3
+                collection_metadata = await metadata_task
+                generator = await self._run_init(
+                    AdaptiveAnswerGenerator,
+                    llm=self.llm,
+                    embeddings=self.embeddings,
+                    collection_metadata=collection_metadata,
+                    scope_config=self.config.scope_detection
+                )
+                startup_events.append("answer_generator")
+                return generator
+
+            # Run Group 3 in parallel (retrieval engines included)
+            async with self._init_group("GROUP 3") as tg:
+                metadata_task = tg.create_task(init_metadata())
+                memory_task = tg.create_task(init_conversation_memory())
+                scorer_task = tg.create_task(init_confidence_scorer())
+                retrieval_task = tg.create_task(init_retrieval_engine())
+                generator_task = tg.create_task(init_answer_generator(metadata_task))
+
+            self.collection_metadata = metadata_task.result()
+            self.conversation_memory = memory_task.result()
+            self.confidence_scorer = scorer_task.result()
+            self.retrieval_engine = retrieval_task.result()
+            self.answer_generator = generator_task.result()
+            logger.info("[GROUP 3] ✓ Loaded: %s", ", ".join(startup_events))
+
+            if metadata_recompute_path is not None:
+                self._metadata_task = asyncio.create_task(
+                    self._recompute_metadata_background(metadata_recompute_path)
+                )
 
             self.initialized = True
-            logger.info("\n" + "=" * 60)
             logger.info("RAG ENGINE READY (PARALLEL INIT COMPLETE)")
-            logger.info("=" * 60)
 
             return True, "RAG Engine initialized successfully"
 
@@ -406,6 +561,121 @@ class RAGEngine:
             logger.error(f"Initialization failed: {e}", exc_info=True)
             return False, f"Initialization failed: {str(e)}"
 
+        finally:
+            self._init_executor.shutdown(wait=False)
+            self._init_executor = None
+
+    @staticmethod
+    @asynccontextmanager
+    async def _init_group(name: str):
+        """
+        TaskGroup for a parallel init group.
+
+        The first failing component cancels its siblings (fail fast instead of
+        waiting for e.g. a slow vectorstore load), and its exception is re-raised
+        unwrapped so initialize() reports the real cause.
+        """
+        try:
+            async with asyncio.TaskGroup() as tg:
+                yield tg
+        except ExceptionGroup as eg:
+            for exc in eg.exceptions:
+                logger.error(f"Parallel init failed in {name}: {exc}")
+            raise eg.exceptions[0]
+
+    async def _run_init(self, func, *args, **kwargs):
+        """Run a blocking startup call on the dedicated init thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._init_executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    async def _recompute_metadata_background(self, metadata_path: Path):
+        """Compute collection metadata off the startup path and attach it when done"""
+        logger.info("Computing collection metadata in background...")
+        try:
+            metadata = await asyncio.to_thread(
+                CollectionMetadata.load_or_compute,
+                vectorstore=self.vectorstore,
+                embeddings=self.embeddings,
+                llm=None,
+                metadata_path=metadata_path,
+                force_recompute=self.config.scope_detection.force_recompute
+            )
+        except Exception as e:
+            logger.warning(f"⚠ Background metadata computation failed: {e}")
+            return
+
+        self.collection_metadata = metadata
+        if self.answer_generator:
+            self.answer_generator.collection_metadata = metadata
+        logger.info("✓ Collection metadata ready (background)")
+
+    @staticmethod
+    def _read_bm25_metadata(metadata_file: Path) -> Dict:
+        """
+        Read BM25 chunk metadata, preferring a memory-mapped msgpack sidecar.
+
+        The first load parses the JSON (orjson, raw bytes) and writes
+        chunk_metadata.msgpack next to it; later startups decode the sidecar
+        straight from an mmap. A sidecar older than the JSON is ignored.
+        """
+        packed_file = metadata_file.with_suffix(".msgpack")
+
+        try:
+            if packed_file.stat().st_mtime >= metadata_file.stat().st_mtime:
+                with open(packed_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return msgpack.unpackb(mm, raw=False)
+        except (OSError, ValueError, msgpack.UnpackException) as e:
+            if packed_file.exists():
+                logger.warning(f"  ⚠ Ignoring unreadable BM25 msgpack cache: {e}")
+
+        data = orjson.loads(metadata_file.read_bytes())
+
+        try:
+            tmp_file = packed_file.with_suffix(".msgpack.tmp")
+            tmp_file.write_bytes(msgpack.packb(data, use_bin_type=True))
+            os.replace(tmp_file, packed_file)
+        except OSError as e:
+            logger.warning(f"  ⚠ Could not write BM25 msgpack cache: {e}")
+
+        return data
+
+    @staticmethod
+    def _build_bm25_retriever(
+        texts: List[str],
+        metadatas: List[Dict],
+        metadata_file: Path
+    ) -> "BM25SRetriever":
+        """
+        Load the persisted bm25s index, or build it and save it for next time.
+
+        The index directory is keyed by a content signature of
+        chunk_metadata.json (see bm25.index_dir_for); its score matrix is
+        memory-mapped on load. Indexes for older corpora are removed.
+        """
+        from .bm25 import BM25SRetriever, index_dir_for, remove_stale_indexes
+
+        index_dir = index_dir_for(metadata_file)
+
+        try:
+            if (index_dir / "params.index.json").exists():
+                return BM25SRetriever.load(index_dir, texts, metadatas)
+        except (OSError, ValueError) as e:
+            logger.warning(f"  ⚠ Ignoring unreadable BM25 index: {e}")
+
+        retriever = BM25SRetriever.from_texts(texts, metadatas)
+
+        try:
+            retriever.save(index_dir)
+            remove_stale_indexes(index_dir)
+        except OSError as e:
+            logger.warning(f"  ⚠ Could not save BM25 index: {e}")
+
+        return retriever
+
     async def query(
         self,
         question: str,
@@ -445,13 +715,13 @@ class RAGEngine:
             timer.start_stage("cache_lookup")
             cached_result = self.cache_manager.get_query_result(
                 question,
-                {"model": self.config.llm.model_name}
+                self._cache_key_ctx
             )
             timer.end_stage()
 
             # PERFORMANCE: Early exit on cache hit (0.86ms average)
             if cached_result:
-                logger.info(f"[CACHE HIT - FAST PATH] {question[:50]}...")
+                logger.info("[CACHE HIT - FAST PATH] %.50s...", question)
                 timing_breakdown = timer.get_breakdown()
                 cached_result["metadata"]["processing_time_ms"] = timing_breakdown["total_ms"]
                 cached_result["metadata"]["timing_breakdown"] = timing_breakdown
@@ -471,8 +741,24 @@ class RAGEngine:
                 )
             timer.end_stage()
 
+            # Stage 2b: Semantic cache lookup (paraphrases of standalone questions)
+            timer.start_stage("semantic_cache_lookup")
+            index_text = standalone_question(question, enhanced_query)
+            cached_result, query_vector = await self._semantic_cache_lookup(index_text)
+            timer.end_stage()
+
+            if cached_result:
+                logger.info("[SEMANTIC CACHE HIT] %.50s...", question)
+                timing_breakdown = timer.get_breakdown()
+                cached_result["metadata"]["processing_time_ms"] = timing_breakdown["total_ms"]
+                cached_result["metadata"]["timing_breakdown"] = timing_breakdown
+                cached_result["metadata"]["cache_hit"] = True
+                cached_result["metadata"]["optimization"] = "semantic_query_index"
+                return cached_result
+
             # Stage 3: Document retrieval (with sub-stage timing)
-            if mode == "simple":
+            # Hybrid retrieval needs BM25; without it, use the dense path
+            if mode == "simple" or self.bm25_retriever is None:
                 # BUGFIX: Pass both original question and enhanced query
                 # - original question used for multi-query expansion decision
                 # - enhanced query used for retrieval if multi-query not activated
@@ -513,28 +799,21 @@ class RAGEngine:
             )
             timer.end_stage()
 
-            # Stage 4.5: Confidence scoring
-            timer.start_stage("confidence_scoring")
-            confidence_data = None
+            # Stage 4.5: Confidence scoring - launched in a worker thread so it
+            # overlaps result assembly instead of running serially on the loop
+            confidence_task = None
             if self.confidence_scorer and retrieval_result.documents:
-                try:
-                    confidence_data = self.confidence_scorer.calculate_confidence(
-                        query=question,
-                        answer=answer,
-                        documents=retrieval_result.documents[:3],
-                        retrieval_scores=retrieval_result.scores[:3]
-                    )
-                    logger.info(f"Confidence: {confidence_data['overall']:.2f} ({confidence_data['interpretation']})")
-                except Exception as e:
-                    logger.warning(f"Confidence scoring failed: {e}")
-            timer.end_stage()
+                confidence_task = asyncio.create_task(asyncio.to_thread(
+                    self.confidence_scorer.calculate_confidence,
+                    query=question,
+                    answer=answer,
+                    documents=retrieval_result.documents[:3],
+                    retrieval_scores=retrieval_result.scores[:3]
+                ))
 
-            # Stage 5: Post-processing (memory & cache) - OPTIMIZATION: Fire and forget
+            # Stage 5: Post-processing (result assembly; memory & cache are fire and forget)
             timer.start_stage("post_processing")
 
-            # Get final timing breakdown
-            timing_breakdown = timer.get_breakdown()
-
             # OPTIMIZATION: Simplified result structure (remove optional explanation for speed)
             result = {
                 "answer": answer,
@@ -543,56 +822,49 @@ class RAGEngine:
                     "strategy_used": retrieval_result.strategy_used,  # BUGFIX: Use actual strategy (e.g., multi_query_fusion)
                     "query_type": "simple" if mode == "simple" else retrieval_result.query_type,
                     "mode": mode,
-                    "processing_time_ms": timing_breakdown["total_ms"],
-                    "timing_breakdown": timing_breakdown,
                     "cache_hit": False,
                     "optimization": "speed_optimized"
                 },
                 "error": False
             }
 
-            # Add confidence data if available
-            if confidence_data:
-                result["metadata"]["confidence"] = confidence_data["overall"]
-                result["metadata"]["confidence_interpretation"] = confidence_data["interpretation"]
-                result["metadata"]["confidence_signals"] = confidence_data["signals"]
-
-            # OPTIMIZATION: Run memory & cache updates asynchronously (don't block response)
-            # This shaves off 50-100ms from response time
-            async def _background_updates():
+            # Join confidence scoring (only the residual wait is timed)
+            timer.start_stage("confidence_scoring")
+            if confidence_task is not None:
                 try:
-                    # Store in conversation memory
-                    if self.conversation_memory:
-                        await asyncio.to_thread(
-                            self.conversation_memory.add,
-                            query=question,
-                            response=answer,
-                            retrieved_docs=retrieval_result.documents,
-                            query_type="simple" if mode == "simple" else retrieval_result.query_type,
-                            strategy_used=retrieval_result.strategy_used  # BUGFIX: Use actual strategy
-                        )
-
-                    # Cache result (sync operation, but fire and forget)
-                    self.cache_manager.put_query_result(
-                        question,
-                        {"model": self.config.llm.model_name},
-                        result
-                    )
+                    confidence_data = await confidence_task
+                    logger.info("Confidence: %.2f (%s)", confidence_data['overall'], confidence_data['interpretation'])
+                    result["metadata"]["confidence"] = confidence_data["overall"]
+                    result["metadata"]["confidence_interpretation"] = confidence_data["interpretation"]
+                    result["metadata"]["confidence_signals"] = confidence_data["signals"]
                 except Exception as e:
-                    logger.warning(f"Background update failed (non-critical): {e}")
+                    logger.warning("Confidence scoring failed: %s", e)
+            timer.end_stage()
 
-            # Fire and forget background updates
-            asyncio.create_task(_background_updates())
+            # Get final timing breakdown
+            timing_breakdown = timer.get_breakdown()
+            result["metadata"]["processing_time_ms"] = timing_breakdown["total_ms"]
+            result["metadata"]["timing_breakdown"] = timing_breakdown
 
-            timer.end_stage()  # End post-processing
+            # OPTIMIZATION: Run memory & cache updates in the background (don't block response)
+            # This shaves off 50-100ms from response time
+            if query_vector is not None:
+                self._query_index.add(query_vector, question)
+            self._schedule_write(self._postprocess_async(
+                question,
+                answer,
+                retrieval_result,
+                result["metadata"],
+                result["sources"]
+            ))
 
             self.query_count += 1
-            logger.info(f"[OPTIMIZED] Query processed in {timing_breakdown['total_ms']:.1f}ms")
+            logger.info("[OPTIMIZED] Query processed in %.1fms", timing_breakdown['total_ms'])
 
             return result
 
         except Exception as e:
-            logger.error(f"Query processing failed: {e}", exc_info=True)
+            logger.error("Query processing failed: %s", e, exc_info=True)
             timing_breakdown = timer.get_breakdown()
 
             return {
@@ -630,11 +902,41 @@ class RAGEngine:
         )
 
         # Store in cache
-        import numpy as np
         await self.embedding_cache.set(text, np.array(embedding, dtype=np.float32))
 
         return embedding
 
+    async def _semantic_cache_lookup(
+        self,
+        question: Optional[str]
+    ) -> Tuple[Optional[Dict], Optional[List[float]]]:
+        """
+        Look up the query cache through the semantic query index.
+
+        `question` is the standalone question (see standalone_question), or
+        None to skip the lookup, as for contextualized follow-ups. Returns
+        (cached_result or None, query vector or None).
+
+        The vector is taken from embeddings.embed_query (the
+        QueryCachingEmbeddings LRU) rather than get_cached_embedding. A
+        standalone question is also the text the dense search embeds next, so
+        the encoder pass that fills the LRU here is the one retrieval would
+        run anyway, not an extra one; and there is no Redis round trip. The
+        miss runs on the embed pool.
+        """
+        if question is None:
+            return None, None
+        query_vector = await asyncio.get_running_loop().run_in_executor(
+            self._embed_pool, self.embeddings.embed_query, question
+        )
+        key = self._query_index.search(query_vector)
+        if key is None:
+            return None, query_vector
+        cached = await asyncio.to_thread(
+            self.cache_manager.get_query_result, key, self._cache_key_ctx
+        )
+        return cached, query_vector
+
     async def _simple_retrieve(
         self,
         query: str,
@@ -646,17 +948,27 @@ class RAGEngine:
 
         PERFORMANCE: Optimized for speed with reduced K and simplified scoring
         Multi-Query Fusion: Automatically activates for vague queries when enabled in config
+        Single-flight: concurrent calls for the same query await one shared retrieval
         """
 
         # Delegate to retrieval engine which handles multi-query fusion logic
         if timer:
             timer.start_stage("retrieval.simple")
 
-        # BUGFIX: Pass original_query for multi-query expansion decision
-        retrieval_result = await self.retrieval_engine._simple_retrieval(
-            query,
-            original_query=original_query
-        )
+        # OPTIMIZATION: Concurrent identical requests share one in-flight retrieval
+        # (shielded so one caller's cancellation doesn't cancel the others)
+        key = (query, original_query)
+        pending = self._inflight_retrievals.get(key)
+        if pending is None:
+            # BUGFIX: Pass original_query for multi-query expansion decision
+            pending = asyncio.create_task(self.retrieval_engine._simple_retrieval(
+                query,
+                original_query=original_query
+            ))
+            self._inflight_retrievals[key] = pending
+            pending.add_done_callback(lambda _: self._inflight_retrievals.pop(key, None))
+
+        retrieval_result = await asyncio.shield(pending)
 
         if timer:
             timer.end_stage()
@@ -675,52 +987,79 @@ class RAGEngine:
           excerpt: str,
           metadata: Dict[str, Any]
         }
+
+        The returned list may come from the sources pool. Callers that keep it
+        (result dicts) simply never release it; ephemeral consumers hand it
+        back with _release_sources() once it has been serialized.
         """
-        sources = []
-        seen_files = set()
+        sources = self._sources_pool.pop() if self._sources_pool else []
+        sources.clear()
 
+        # First (highest-ranked) hit per file, in rank order: one hash per doc
+        unique_docs: Dict[str, Tuple] = {}
         for doc, score in zip(
             retrieval_result.documents,
             retrieval_result.scores
         ):
-            file_name = doc.metadata.get('file_name', 'Unknown')
+            unique_docs.setdefault(doc.metadata.get('file_name', 'Unknown'), (doc, score))
 
-            if file_name in seen_files:
-                continue
+        for file_name, (doc, score) in unique_docs.items():
+            metadata = doc.metadata
 
-            seen_files.add(file_name)
+            # File extension as file_type (.pdf -> pdf); no extension -> 'unknown'
+            stem, _, extension = file_name.rpartition('.')
+            content = doc.page_content
 
-            # Extract file extension for file_type
-            file_extension = os.path.splitext(file_name)[1]
-            if file_extension:
-                file_type = file_extension[1:]  # Remove leading dot (.pdf -> pdf)
-            else:
-                file_type = 'unknown'
-
-            # Truncate excerpt to 500 characters
-            excerpt = doc.page_content[:500] + "..." if len(doc.page_content) > 500 else doc.page_content
-
-            # Format to match Source schema
-            source_dict = {
+            # Format to match Source schema (excerpt truncated to 500 characters)
+            sources.append({
                 "file_name": file_name,
-                "file_type": file_type,
+                "file_type": extension if stem and extension else 'unknown',
                 "relevance_score": float(score),
-                "excerpt": excerpt,
-                "metadata": {}
-            }
+                "excerpt": content[:500] + "..." if len(content) > 500 else content,
+                "metadata": {k: v for k, v in metadata.items() if k != 'file_name'}
+            })
 
-            # Add page number to metadata if available
-            if 'page_number' in doc.metadata:
-                source_dict["metadata"]["page_number"] = doc.metadata['page_number']
+        return sources
 
-            # Add any other metadata fields
-            for key, value in doc.metadata.items():
-                if key not in ['file_name', 'page_number']:
-                    source_dict["metadata"][key] = value
+    def _release_sources(self, sources: List[Dict]):
+        """Return a formatted sources list to the pool once nothing references it"""
+        self._sources_pool.append(sources)
 
-            sources.append(source_dict)
+    def _postprocess(
+        self,
+        question: str,
+        answer: str,
+        retrieval_result: RetrievalResult,
+        metadata: Dict,
+        formatted_sources: List[Dict]
+    ):
+        """
+        Store a finished exchange in conversation memory and the query cache.
 
-        return sources
+        Takes the already-derived artifacts (metadata, formatted sources) so the
+        retrieved documents are not re-walked or re-formatted per sink. The
+        cached payload gets its own copy of the sources list, so callers may
+        recycle formatted_sources afterwards.
+        """
+        if self.conversation_memory:
+            self.conversation_memory.add(
+                query=question,
+                response=answer,
+                retrieved_docs=retrieval_result.documents,
+                query_type=metadata["query_type"],
+                strategy_used=metadata["strategy_used"]
+            )
+
+        self.cache_manager.put_query_result(
+            question,
+            self._cache_key_ctx,
+            {
+                "answer": answer,
+                "sources": list(formatted_sources),
+                "metadata": metadata,
+                "error": False
+            }
+        )
 
     def clear_conversation(self) -> Tuple[bool, str]:
         """Clear conversation memory AND query cache"""
@@ -736,6 +1075,7 @@ class RAGEngine:
             # CRITICAL FIX: Also clear the Redis query cache
             if self.cache_manager:
                 self.cache_manager.clear_all()
+                self._query_index.clear()
                 logger.info("Query cache cleared")
                 cleared_items.append("query cache")
 
@@ -767,6 +1107,7 @@ class RAGEngine:
                 # Update config
                 old_model = self.config.llm.model_name
                 self.config.llm.model_name = new_model
+                self._cache_key_ctx = {"model": new_model}
 
                 # Recreate LLM with new model
                 try:
@@ -783,6 +1124,7 @@ class RAGEngine:
                     # Clear cache (old model's answers not compatible)
                     if self.cache_manager:
                         self.cache_manager.clear_all()
+                        self._query_index.clear()
                         logger.info("Cache cleared after model switch")
 
                     logger.info(f"✓ LLM hot-swapped successfully: {old_model} → {new_model}")
@@ -792,6 +1134,7 @@ class RAGEngine:
                     # Rollback on failure
                     logger.error(f"Hot-swap failed, rolling back: {e}")
                     self.config.llm.model_name = old_model
+                    self._cache_key_ctx = {"model": old_model}
                     self.llm = create_llm(self.config, test_connection=False)
                     return False, f"Model hot-swap failed: {str(e)}", self.runtime_settings.copy()
 
@@ -800,8 +1143,19 @@ class RAGEngine:
                 new_temp = max(0.0, min(2.0, float(kwargs['temperature'])))
                 logger.info(f"HOT-SWAP: Updating temperature to {new_temp}")
                 self.config.llm.temperature = new_temp
-                # Recreate LLM with new temperature
-                self.llm = create_llm(self.config, test_connection=False)
+                if hasattr(self.llm, 'temperature'):
+                    # Mutate in place: keeps the client's warm connections, and every
+                    # component sharing this LLM picks up the change
+                    self.llm.temperature = new_temp
+                else:
+                    # Recreate LLM with new temperature
+                    self.llm = create_llm(self.config, test_connection=False)
+                    if self.conversation_memory:
+                        self.conversation_memory.llm = self.llm
+                    if self.retrieval_engine:
+                        self.retrieval_engine.llm = self.llm
+                    if self.answer_generator:
+                        self.answer_generator.llm = self.llm
                 updated.append('temperature')
 
             # Standard settings
@@ -856,8 +1210,8 @@ class RAGEngine:
         Stream query processing with real-time token generation.
 
         Yields chunks as they are generated:
-        - {"type": "sources", "content": [...]} - Retrieved sources
         - {"type": "token", "content": "..."} - Generated tokens
+        - {"type": "sources", "content": [...]} - Retrieved sources (once formatted, mid-stream)
         - {"type": "metadata", "content": {...}} - Processing metadata
         - {"type": "done"} - Completion signal
         """
@@ -865,52 +1219,90 @@ class RAGEngine:
             yield {"type": "error", "content": "RAG Engine not initialized"}
             return
 
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
+
+        # FAST PATH: Trivial conversational queries skip retrieval and the LLM
+        # (deterministic canned response, so no cache write either)
+        if mode == "simple":
+            trivial_answer = self._match_trivial(question)
+            if trivial_answer is not None:
+                yield {"type": "sources", "content": []}
+                yield {"type": "token", "content": trivial_answer}
+                yield {
+                    "type": "metadata",
+                    "content": {
+                        "strategy_used": "trivial_direct",
+                        "query_type": "simple",
+                        "mode": mode,
+                        "processing_time_ms": (time.perf_counter() - start_time) * 1000
+                    }
+                }
+                yield {"type": "done"}
+                return
 
         try:
+            # Enhance query with context (if enabled) in a worker thread while
+            # the cache is checked
+            enhance_task = None
+            if use_context and self.conversation_memory:
+                enhance_task = asyncio.create_task(asyncio.to_thread(
+                    self.conversation_memory.get_relevant_context_for_query,
+                    question,
+                    max_exchanges=3
+                ))
+
             # Check cache first
             cached_result = self.cache_manager.get_query_result(
                 question,
-                {"model": self.config.llm.model_name}
+                self._cache_key_ctx
             )
 
+            enhanced_query = question
+            if enhance_task is not None:
+                if cached_result:
+                    enhance_task.cancel()
+                else:
+                    enhanced_query, _ = await enhance_task
+
+            # Paraphrases of earlier standalone questions hit through the semantic query index
+            index_text = standalone_question(question, enhanced_query)
+            query_vector = None
+            if not cached_result:
+                cached_result, query_vector = await self._semantic_cache_lookup(index_text)
+
             if cached_result:
-                logger.info(f"[CACHE HIT STREAM] {question[:50]}...")
+                logger.info("[CACHE HIT STREAM] %.50s...", question)
                 # Send cached result as rapid stream
                 yield {"type": "sources", "content": cached_result["sources"]}
 
-                # Stream the answer token by token for consistency
+                # Replay the answer in fixed-size slices (no artificial delay;
+                # the client renders bursts fine)
                 answer = cached_result["answer"]
-                for i, char in enumerate(answer):
-                    yield {"type": "token", "content": char}
-                    if i % 5 == 0:  # Small delay every 5 chars for smooth display
-                        await asyncio.sleep(0.01)
+                step = self.CACHED_STREAM_CHUNK_CHARS
+                for i in range(0, len(answer), step):
+                    yield {"type": "token", "content": answer[i:i + step]}
 
+                # Flag the replay so the UI can skip its streaming animation
+                cached_result["metadata"]["processing_time_ms"] = (time.perf_counter() - start_time) * 1000
+                cached_result["metadata"]["cache_hit"] = True
                 yield {"type": "metadata", "content": cached_result["metadata"]}
                 yield {"type": "done"}
                 return
 
-            # Enhance query with context if enabled
-            enhanced_query = question
-            if use_context and self.conversation_memory:
-                enhanced_query, _ = self.conversation_memory.get_relevant_context_for_query(
-                    question,
-                    max_exchanges=3
-                )
-
-            # Perform retrieval
-            if mode == "simple":
+            # Perform retrieval (dense-only when BM25 is offline)
+            if mode == "simple" or self.bm25_retriever is None:
                 retrieval_result = await self._simple_retrieve(enhanced_query)
             else:
                 retrieval_result = await self.retrieval_engine.retrieve(
                     query=enhanced_query
                 )
 
-            # Send sources immediately
-            yield {
-                "type": "sources",
-                "content": self._format_sources(retrieval_result)
-            }
+            # OPTIMIZATION: Format sources off the event loop while the LLM starts;
+            # they are sent as soon as they are ready (the client handles any order)
+            sources_task = asyncio.create_task(
+                asyncio.to_thread(self._format_sources, retrieval_result)
+            )
+            sources_sent = False
 
             # Stream the answer generation
             answer_tokens = []
@@ -918,16 +1310,25 @@ class RAGEngine:
             async for token in self._stream_answer(question, retrieval_result):
                 yield {"type": "token", "content": token}
                 answer_tokens.append(token)
+                if not sources_sent and sources_task.done():
+                    yield {"type": "sources", "content": sources_task.result()}
+                    sources_sent = True
+
+            # Sources are formatted once and reused for the cache payload
+            formatted_sources = await sources_task
+            if not sources_sent:
+                yield {"type": "sources", "content": formatted_sources}
 
             # Finalize
             full_answer = "".join(answer_tokens)
-            processing_time = (asyncio.get_event_loop().time() - start_time) * 1000
+            processing_time = (time.perf_counter() - start_time) * 1000
 
             metadata = {
                 "strategy_used": "simple_dense" if mode == "simple" else retrieval_result.strategy_used,
                 "query_type": "simple" if mode == "simple" else retrieval_result.query_type,
                 "mode": mode,
-                "processing_time_ms": processing_time
+                "processing_time_ms": processing_time,
+                "cache_hit": False
             }
 
             # Add query variants for transparency (only when multi-query fusion is used)
@@ -937,35 +1338,93 @@ class RAGEngine:
             yield {"type": "metadata", "content": metadata}
             yield {"type": "done"}
 
-            # Store in memory and cache
-            if self.conversation_memory:
-                self.conversation_memory.add(
-                    query=question,
-                    response=full_answer,
-                    retrieved_docs=retrieval_result.documents,
-                    query_type="simple" if mode == "simple" else retrieval_result.query_type,
-                    strategy_used="simple_dense" if mode == "simple" else retrieval_result.strategy_used
-                )
-
-            # Cache the full result
-            result = {
-                "answer": full_answer,
-                "sources": self._format_sources(retrieval_result),
-                "metadata": metadata,
-                "error": False
-            }
-            self.cache_manager.put_query_result(
+            # Store in memory and cache in the background, then recycle the sources buffer
+            if query_vector is not None:
+                self._query_index.add(query_vector, question)
+            self._schedule_write(self._postprocess_async(
                 question,
-                {"model": self.config.llm.model_name},
-                result
-            )
+                full_answer,
+                retrieval_result,
+                metadata,
+                formatted_sources,
+                release_sources=True
+            ))
 
             self.query_count += 1
 
         except Exception as e:
-            logger.error(f"Stream query error: {e}", exc_info=True)
+            logger.error("Stream query error: %s", e, exc_info=True)
             yield {"type": "error", "content": str(e)}
 
+    async def _postprocess_async(
+        self,
+        question: str,
+        answer: str,
+        retrieval_result: RetrievalResult,
+        metadata: Dict,
+        formatted_sources: List[Dict],
+        release_sources: bool = False
+    ):
+        """Run _postprocess in a worker thread; failures are logged, never raised"""
+        try:
+            await asyncio.to_thread(
+                self._postprocess,
+                question,
+                answer,
+                retrieval_result,
+                metadata,
+                formatted_sources
+            )
+        except Exception as e:
+            logger.warning("Background update failed (non-critical): %s", e)
+        finally:
+            if release_sources:
+                self._release_sources(formatted_sources)
+
+    def _schedule_write(self, coro):
+        """
+        Run a write-back coroutine as a tracked background task.
+
+        The task is held in _pending_writes until it finishes (so it can't be
+        garbage-collected mid-flight) and shutdown() drains whatever is left.
+        """
+        task = asyncio.create_task(coro)
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def shutdown(self):
+        """Flush pending background writes and release the engine's thread pools"""
+        # The metadata recompute only refreshes an on-disk cache; don't hold
+        # shutdown for it
+        if self._metadata_task is not None:
+            self._metadata_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._metadata_task
+            self._metadata_task = None
+
+        if self._pending_writes:
+            logger.info(f"Flushing {len(self._pending_writes)} pending background writes...")
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+        if self._embed_pool is not None:
+            self._embed_pool.shutdown(wait=False)
+            self._embed_pool = None
+
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+
+    def _match_trivial(self, question: str) -> Optional[str]:
+        """Return a canned response if the question is conversational filler"""
+        text = question.strip()
+        if not text or len(text) > self.TRIVIAL_MAX_LENGTH:
+            return None
+
+        for pattern, response in self.TRIVIAL_RESPONSES:
+            if pattern.match(text):
+                return response
+        return None
+
     async def _stream_answer(self, question: str, retrieval_result: RetrievalResult):
         """Stream answer generation token by token"""
         try:
@@ -973,51 +1432,42 @@ class RAGEngine:
             query_type = retrieval_result.query_type
 
             # Limit context chunks and truncate
-            max_sources = 3 if query_type == "simple" else 5
-            max_chunk_length = 300 if query_type == "simple" else 400
-
-            context_parts = []
-            for i, (doc, score) in enumerate(zip(
-                retrieval_result.documents[:max_sources],
-                retrieval_result.scores[:max_sources]
-            ), 1):
-                source = doc.metadata.get('file_name', 'Unknown').split('/')[-1]
-                chunk = doc.page_content[:max_chunk_length]
-                if len(doc.page_content) > max_chunk_length:
-                    chunk += "..."
-                context_parts.append(f"[{i}] {chunk}")
-
-            context = "\n\n".join(context_parts)
-
-            # Build prompt based on query type
-            if query_type == "simple":
-                prompt = f"""Answer from sources. Be brief.
-
-{context}
-
-Q: {question}
-A:"""
-            elif query_type == "moderate":
-                prompt = f"""Answer from sources below. Cite [number].
-
-{context}
-
-Q: {question}
-A:"""
-            else:
-                prompt = f"""Answer comprehensively from sources. Cite [number].
-
-{context}
-
-Q: {question}
-A:"""
+            max_sources, max_chunk_length = self.CONTEXT_LIMITS.get(
+                query_type, self.DEFAULT_CONTEXT_LIMITS
+            )
 
-            # Stream from LLM
-            for chunk in self.llm.stream(prompt):
-                yield chunk
+            # Prompt only needs the (truncated) text; scores and source names are unused
+            context = "\n\n".join([
+                f"[{i}] {doc.page_content[:max_chunk_length]}"
+                f"{'...' if len(doc.page_content) > max_chunk_length else ''}"
+                for i, doc in enumerate(retrieval_result.documents[:max_sources], 1)
+            ])
+
+            # Build prompt based on query type (single substitution into a fixed skeleton)
+            template = self.STREAM_PROMPTS.get(query_type, self.DEFAULT_STREAM_PROMPT)
+            prompt = template % (context, question)
+
+            # Stream from LLM, coalescing tiny chunks (char-level backends) into
+            # fewer, larger events; flushes on size or elapsed time
+            loop = asyncio.get_running_loop()
+            buffer = []
+            buffered = 0
+            last_flush = loop.time()
+            async for chunk in self.llm.astream(prompt):
+                buffer.append(chunk)
+                buffered += len(chunk)
+                now = loop.time()
+                if buffered >= self.STREAM_FLUSH_CHARS or now - last_flush >= self.STREAM_FLUSH_INTERVAL_S:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                    last_flush = now
+
+            if buffer:
+                yield "".join(buffer)
 
         except Exception as e:
-            logger.error(f"Answer streaming error: {e}", exc_info=True)
+            logger.error("Answer streaming error: %s", e, exc_info=True)
             yield f"[Error: {str(e)}]"
 
     def get_status(self) -> Dict:
@@ -1029,7 +1479,7 @@ A:"""
                 "components": {}
             }
 
-        uptime = datetime.now() - self.start_time
+        uptime_seconds = time.monotonic() - self.start_time
 
         components = {
             "vectorstore": "ready" if self.vectorstore else "offline",
@@ -1043,7 +1493,7 @@ A:"""
             "status": "operational",
             "message": "All systems operational",
             "components": components,
-            "uptime_seconds": uptime.total_seconds(),
+            "uptime_seconds": uptime_seconds,
             "query_count": self.query_count,
             "current_mode": self.current_mode,
             "config": {
@@ -5,15 +5,14 @@ Main application entry point
 
 import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
-from typing import Dict
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from fastapi.responses import ORJSONResponse, Response
+from starlette.routing import Route
+import orjson
+import redis.asyncio as aioredis
 
 from .core.rag_engine import RAGEngine
 from .api.query import router as query_router, set_rag_engine as set_query_engine
@@ -22,6 +21,10 @@ from .api.documents import router as documents_router, set_rag_engine as set_doc
 from .api.documents_coverage import router as coverage_router, set_rag_engine as set_coverage_engine
 from .api.models import router as models_router
 from .models.schemas import HealthResponse
+from .utils.compression import SelectiveGZipMiddleware
+from .utils.cors import FastCORSMiddleware
+from .utils.errors import ErrorASGI
+from .utils.rate_limit import RateLimitASGI
 
 # Configure logging
 logging.basicConfig(
@@ -30,13 +33,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# SECURITY: Initialize rate limiter
-# Limit: 5 requests per minute per IP address
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
-
 # Global RAG engine instance
 rag_engine: RAGEngine = None
 
+# Interactive docs and the OpenAPI schema (FASTAPI_DOCS=0 disables them)
+_DOCS_ENABLED = os.getenv("FASTAPI_DOCS", "1") == "1"
+
+# Startup banner, built once and logged as a single record
+_READY_BANNER = "\n".join([
+    "=" * 70,
+    "BACKEND READY - Listening on port 8000",
+    "=" * 70,
+    "",
+    "Available endpoints:",
+    "  - GET  /api/health          - Health check",
+    "  - POST /api/query           - Process query",
+    "  - POST /api/conversation/clear - Clear conversation",
+    "  - GET  /api/settings        - Get settings",
+    "  - PUT  /api/settings        - Update settings",
+    "  - POST /api/settings/reset  - Reset settings",
+    "  - GET  /api/documents       - List all indexed documents",
+    "  - POST /api/documents/upload - Upload new document",
+    "  - POST /api/documents/reindex - Reindex all documents",
+    "  - GET  /api/models          - List available LLM models",
+    "  - POST /api/models/select   - Select LLM model",
+    *([
+        "  - GET  /docs                - API documentation (Swagger)",
+        "  - GET  /redoc               - API documentation (ReDoc)",
+    ] if _DOCS_ENABLED else []),
+    "",
+])
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -55,7 +82,22 @@ async def lifespan(app: FastAPI):
         # Initialize RAG engine with config from file
         logger.info("Initializing RAG Engine...")
         from _src.config import load_config
-        rag_engine = RAGEngine(load_config('config.yml'))
+        config = load_config('config.yml')
+        rag_engine = RAGEngine(config)
+
+        # Redis pool for the rate limiter (app.state.redis), owned by the lifespan
+        # alone: the engine manages its own connections, so shutting the engine
+        # down never closes this pool under an in-flight limiter call.
+        # Short socket timeouts: the limiter runs on every request and fails
+        # open, so a stalled Redis must not stall the API behind it
+        redis_pool = aioredis.ConnectionPool(
+            host=config.cache.redis_host,
+            port=config.cache.redis_port,
+            max_connections=64,
+            socket_connect_timeout=0.25,
+            socket_timeout=0.25
+        )
+        app.state.redis = aioredis.Redis(connection_pool=redis_pool)
 
         success, message = await rag_engine.initialize()
 
@@ -68,25 +110,7 @@ async def lifespan(app: FastAPI):
         set_documents_engine(rag_engine)
         set_coverage_engine(rag_engine)
 
-        logger.info("=" * 70)
-        logger.info("BACKEND READY - Listening on port 8000")
-        logger.info("=" * 70)
-        logger.info("")
-        logger.info("Available endpoints:")
-        logger.info("  - GET  /api/health          - Health check")
-        logger.info("  - POST /api/query           - Process query")
-        logger.info("  - POST /api/conversation/clear - Clear conversation")
-        logger.info("  - GET  /api/settings        - Get settings")
-        logger.info("  - PUT  /api/settings        - Update settings")
-        logger.info("  - POST /api/settings/reset  - Reset settings")
-        logger.info("  - GET  /api/documents       - List all indexed documents")
-        logger.info("  - POST /api/documents/upload - Upload new document")
-        logger.info("  - POST /api/documents/reindex - Reindex all documents")
-        logger.info("  - GET  /api/models          - List available LLM models")
-        logger.info("  - POST /api/models/select   - Select LLM model")
-        logger.info("  - GET  /docs                - API documentation (Swagger)")
-        logger.info("  - GET  /redoc               - API documentation (ReDoc)")
-        logger.info("")
+        logger.info(_READY_BANNER)
 
         yield
 
@@ -96,7 +120,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down RAG Engine...")
-    # Add any cleanup logic here if needed
+    if rag_engine is not None:
+        await rag_engine.shutdown()
+    redis_client = getattr(app.state, "redis", None)
+    if redis_client is not None:
+        await redis_client.connection_pool.disconnect()
 
 
 # Create FastAPI app
@@ -134,7 +162,7 @@ app = FastAPI(
 
     ## Security Features
 
-    - **Rate Limiting**: 100 requests/minute per IP (general), 5 requests/minute for query endpoint
+    - **Rate Limiting**: 100 requests/minute per IP, shared across workers (health check exempt)
     - **Input Sanitization**: Removes null bytes, control characters
     - **Prompt Injection Detection**: Logs suspicious patterns
     - **Input Validation**: Maximum 10,000 characters, no empty queries
@@ -145,46 +173,74 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc"
+    default_response_class=ORJSONResponse,  # PERFORMANCE: orjson for every JSON response
+    # FASTAPI_DOCS=0 (production) disables Swagger/ReDoc and /openapi.json, so the
+    # schema, including every json_schema_extra example, is never generated or served
+    docs_url="/docs" if _DOCS_ENABLED else None,
+    redoc_url="/redoc" if _DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if _DOCS_ENABLED else None
+)
+
+# Unhandled errors -> generic JSON 500 (innermost, so CORS headers still apply;
+# exception text is logged, never sent to the client)
+app.add_middleware(ErrorASGI)
+
+# PERFORMANCE: Gzip JSON bodies over 1 KB (query responses with sources/timing);
+# SSE streams are excluded so tokens aren't buffered by the compressor
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    exclude_prefixes=("/api/query/stream",)
 )
 
-# SECURITY: Attach rate limiter to app
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# SECURITY: Rate limiting, 100 requests/minute per IP (Redis-backed, pure ASGI)
+# Added before CORS so CORS stays outermost and 429s still carry CORS headers
+app.add_middleware(RateLimitASGI, limit=100, window_ms=60_000)
 
 # CORS Configuration
 # SECURITY: Restrict origins in production
 # TODO: Set environment variable CORS_ORIGINS in production to specific domains
-import os
 allowed_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001,http://localhost:3002,http://localhost:5173").split(",")
 
+# PERFORMANCE: Origin checks against a frozenset instead of scanning a list
 app.add_middleware(
-    CORSMiddleware,
+    FastCORSMiddleware,
     allow_origins=allowed_origins,  # Restrict to specific origins
-    allow_credentials=True,
+    # Never with "*": that would echo any origin back with credentials allowed
+    allow_credentials="*" not in allowed_origins,
     allow_methods=["GET", "POST", "PUT", "DELETE"],  # Specific methods only
     allow_headers=["Content-Type", "Authorization"],  # Specific headers only
+    max_age=int(os.getenv("CORS_MAX_AGE", "86400")),  # Browsers cache preflights (Chromium caps at 2h)
 )
 
 
-# Exception handlers
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    """Global exception handler for unhandled errors"""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={
-            "detail": "Internal server error",
-            "error": str(exc)
-        }
-    )
+# Fixed health payloads for the not-ready states (polled often during startup),
+# serialized once. Only the bytes are shared: each call wraps them in a fresh
+# Response, since middleware may rewrite a response's headers in place
+_HEALTH_INITIALIZING_BODY = orjson.dumps({
+    "status": "initializing",
+    "message": "RAG Engine is starting up",
+    "components": {}
+})
+_HEALTH_UNHEALTHY_BODY = orjson.dumps({
+    "status": "unhealthy",
+    "message": "RAG Engine initialization failed or incomplete",
+    "components": {}
+})
 
 
 # Health check endpoint
-@app.get("/api/health", response_model=HealthResponse, tags=["health"])
-async def health_check() -> HealthResponse:
+# PERFORMANCE: Returns a plain dict via ORJSONResponse (no response-model
+# validation/encoding pass); HealthResponse still documents the schema
+@app.get(
+    "/api/health",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": HealthResponse}},
+    tags=["health"]
+)
+async def health_check() -> Response:
     """
     Health check endpoint.
 
@@ -220,18 +276,10 @@ async def health_check() -> HealthResponse:
     global rag_engine
 
     if rag_engine is None:
-        return HealthResponse(
-            status="initializing",
-            message="RAG Engine is starting up",
-            components={}
-        )
+        return Response(_HEALTH_INITIALIZING_BODY, media_type="application/json")
 
     if not rag_engine.initialized:
-        return HealthResponse(
-            status="unhealthy",
-            message="RAG Engine initialization failed or incomplete",
-            components={}
-        )
+        return Response(_HEALTH_UNHEALTHY_BODY, media_type="application/json")
 
     # Get detailed status from engine
     status_dict = rag_engine.get_status()
@@ -242,36 +290,48 @@ async def health_check() -> HealthResponse:
         for status in status_dict["components"].values()
     )
 
-    return HealthResponse(
-        status="healthy" if all_ready else "degraded",
-        message=status_dict["message"],
-        components=status_dict["components"]
-    )
+    return ORJSONResponse({
+        "status": "healthy" if all_ready else "degraded",
+        "message": status_dict["message"],
+        "components": status_dict["components"]
+    })
 
 
 # Root endpoint
-@app.get("/", tags=["root"])
-async def root() -> Dict:
+# PERFORMANCE: Static payload, serialized once at import and served by a plain
+# Starlette route (no FastAPI request handling). Each call gets a fresh Response
+# around the shared bytes, since middleware may rewrite its headers in place
+_ROOT_BODY = orjson.dumps({
+    "name": "Tactical RAG API",
+    "version": "1.0.0",
+    "status": "operational",
+    **({"documentation": {
+        "swagger": "/docs",
+        "redoc": "/redoc"
+    }} if _DOCS_ENABLED else {}),
+    "endpoints": {
+        "health": "/api/health",
+        "query": "/api/query",
+        "conversation_clear": "/api/conversation/clear",
+        "settings": "/api/settings"
+    }
+})
+
+
+async def root(request: Request) -> Response:
     """
     Root endpoint - API information.
 
     Returns basic information about the API.
     """
-    return {
-        "name": "Tactical RAG API",
-        "version": "1.0.0",
-        "status": "operational",
-        "documentation": {
-            "swagger": "/docs",
-            "redoc": "/redoc"
-        },
-        "endpoints": {
-            "health": "/api/health",
-            "query": "/api/query",
-            "conversation_clear": "/api/conversation/clear",
-            "settings": "/api/settings"
-        }
-    }
+    return Response(
+        _ROOT_BODY,
+        media_type="application/json",
+        headers={"cache-control": "public, max-age=3600"}
+    )
+
+
+app.router.routes.insert(0, Route("/", root, methods=["GET"]))
 
 
 # Include routers
@@ -286,11 +346,18 @@ app.include_router(models_router)
 if __name__ == "__main__":
     import uvicorn
 
-    logger.info("Starting development server...")
+    # uvloop + httptools (both from uvicorn[standard]) instead of asyncio + h11.
+    # One worker: the engine and its models live in-process (see Dockerfile.production)
+    reload = os.getenv("UVICORN_RELOAD", "1") == "1"
+    logger.info("Starting %s server...", "development" if reload else "production")
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        workers=1,
+        reload=reload,
+        access_log=False,
         log_level="info"
     )
@@ -3,7 +3,7 @@ Pydantic schemas for API request/response models
 """
 
 from typing import Optional, List, Dict, Any, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class QueryRequest(BaseModel):
@@ -20,10 +20,10 @@ class QueryRequest(BaseModel):
         description="Whether to use conversation context for follow-up questions"
     )
 
-    class Config:
+    model_config = ConfigDict(
         # Allow population by both field name and alias
-        populate_by_name = True
-        json_schema_extra = {
+        populate_by_name=True,
+        json_schema_extra={
             "example": {
                 "question": "Can I grow a beard?",
                 "query": "Can I grow a beard?",  # Also show alias example
@@ -31,6 +31,7 @@ class QueryRequest(BaseModel):
                 "use_context": True
             }
         }
+    )
 
 
 class Source(BaseModel):
@@ -41,8 +42,8 @@ class Source(BaseModel):
     excerpt: str = Field(..., description="Relevant excerpt from the document")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "file_name": "AFI36-2903.pdf",
                 "file_type": "pdf",
@@ -54,6 +55,7 @@ class Source(BaseModel):
                 }
             }
         }
+    )
 
 
 class QueryExplanation(BaseModel):
@@ -64,8 +66,8 @@ class QueryExplanation(BaseModel):
     strategy_reasoning: Optional[str] = Field(None, description="Reasoning for strategy selection")
     example_text: Optional[str] = Field(None, description="Example explanation text")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "query_type": "simple",
                 "complexity_score": 0,
@@ -77,6 +79,7 @@ class QueryExplanation(BaseModel):
                 "example_text": "This is a straightforward factual question"
             }
         }
+    )
 
 
 class QueryMetadata(BaseModel):
@@ -92,8 +95,8 @@ class QueryMetadata(BaseModel):
     confidence_interpretation: Optional[str] = Field(None, description="Human-readable confidence level (Low/Medium/High)")
     confidence_signals: Optional[Dict[str, float]] = Field(None, description="Individual confidence signal scores")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "strategy_used": "simple_dense",
                 "query_type": "simple",
@@ -118,6 +121,7 @@ class QueryMetadata(BaseModel):
                 }
             }
         }
+    )
 
 
 class QueryResponse(BaseModel):
@@ -131,8 +135,8 @@ class QueryResponse(BaseModel):
     )
     error: bool = Field(default=False, description="Whether an error occurred")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "answer": "Yes, according to AFI 36-2903, male Airmen are authorized to wear beards under specific medical or religious accommodation conditions.",
                 "sources": [
@@ -154,6 +158,7 @@ class QueryResponse(BaseModel):
                 "error": False
             }
         }
+    )
 
 
 class HealthResponse(BaseModel):
@@ -162,8 +167,8 @@ class HealthResponse(BaseModel):
     message: str = Field(..., description="Status message")
     components: Dict[str, str] = Field(default_factory=dict, description="Component health status")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "message": "All systems operational",
@@ -175,6 +180,7 @@ class HealthResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class ConversationClearResponse(BaseModel):
@@ -182,13 +188,14 @@ class ConversationClearResponse(BaseModel):
     success: bool = Field(..., description="Whether the operation succeeded")
     message: str = Field(..., description="Result message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Conversation memory cleared successfully"
             }
         }
+    )
 
 
 class SettingsUpdate(BaseModel):
@@ -203,8 +210,8 @@ class SettingsUpdate(BaseModel):
     llm_model: Optional[str] = Field(None, description="LLM model name (Ollama model ID)")
     temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="LLM temperature")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "simple_k": 5,
                 "hybrid_k": 20,
@@ -213,6 +220,7 @@ class SettingsUpdate(BaseModel):
                 "temperature": 0.0
             }
         }
+    )
 
 
 class SettingsResponse(BaseModel):
@@ -221,8 +229,8 @@ class SettingsResponse(BaseModel):
     message: str = Field(..., description="Result message")
     current_settings: Dict[str, Any] = Field(..., description="Current runtime settings")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Settings updated successfully",
@@ -237,6 +245,7 @@ class SettingsResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class DocumentInfo(BaseModel):
@@ -248,8 +257,8 @@ class DocumentInfo(BaseModel):
     num_chunks: int = Field(..., description="Number of chunks created from this document")
     processing_date: str = Field(..., description="When the document was last processed")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "file_name": "AFI36-2903.pdf",
                 "file_type": ".pdf",
@@ -259,6 +268,7 @@ class DocumentInfo(BaseModel):
                 "processing_date": "2025-10-12T10:30:00"
             }
         }
+    )
 
 
 class DocumentListResponse(BaseModel):
@@ -267,8 +277,8 @@ class DocumentListResponse(BaseModel):
     total_chunks: int = Field(..., description="Total number of chunks across all documents")
     documents: List[DocumentInfo] = Field(..., description="List of document information")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "total_documents": 5,
                 "total_chunks": 234,
@@ -284,6 +294,7 @@ class DocumentListResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class ReindexResponse(BaseModel):
@@ -294,8 +305,8 @@ class ReindexResponse(BaseModel):
     total_chunks: int = Field(..., description="Total chunks created")
     processing_time_seconds: float = Field(..., description="Time taken to reindex")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Reindexing completed successfully",
@@ -304,3 +315,4 @@ class ReindexResponse(BaseModel):
                 "processing_time_seconds": 12.5
             }
         }
+    )
@@ -0,0 +1,27 @@
+"""
+Gzip middleware that leaves streaming endpoints alone
+"""
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that skips the given path prefixes.
+
+    The stock middleware also compresses StreamingResponse bodies, and the
+    gzip stream only emits output in compressor-sized blocks, so SSE token
+    events would be held back instead of reaching the client as generated.
+    Responses below `minimum_size` are sent uncompressed as usual.
+    """
+
+    def __init__(self, app, exclude_prefixes: Iterable[str] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,34 @@
+"""
+CORS middleware with constant-time origin checks
+"""
+from starlette.middleware.cors import CORSMiddleware
+
+
+class FastCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware with the allowed origins held in a frozenset.
+
+    Starlette already pre-joins the method/header strings for preflight and
+    simple responses at construction; the remaining per-request cost is the
+    origin check, which scans the origins list. Swapping the list for a
+    frozenset makes that a hash lookup. Wildcard and regex handling are
+    inherited unchanged.
+
+    Requests without an Origin header (same-origin, server-to-server,
+    health probes) bypass the CORS logic entirely via a scan of the raw
+    header list, without building a Headers object.
+    """
+
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        self.allow_origins = frozenset(self.allow_origins)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, _ in scope["headers"]:
+                if name == b"origin":
+                    break
+            else:
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
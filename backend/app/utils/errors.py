@@ -0,0 +1,50 @@
+"""
+Pure-ASGI catch-all for unhandled exceptions
+"""
+import logging
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+_ERROR_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_ERROR_BODY)).encode()),
+]
+
+
+class ErrorASGI:
+    """
+    Turn unhandled exceptions into a generic JSON 500.
+
+    The exception is logged with its traceback; the client only gets a
+    fixed, pre-serialized body (no exception text). If the response has
+    already started (e.g. mid-stream), nothing more can be sent, so the
+    exception is re-raised for the server to close the connection.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logger.error("Unhandled exception on %s %s", scope["method"], scope["path"], exc_info=True)
+            if response_started:
+                raise
+            await send({"type": "http.response.start", "status": 500, "headers": _ERROR_HEADERS})
+            await send({"type": "http.response.body", "body": _ERROR_BODY})
@@ -0,0 +1,96 @@
+"""
+Pure-ASGI per-IP rate limiting backed by Redis
+"""
+import logging
+import time
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Fixed window per key: one round trip, atomic across workers/replicas.
+# Returns {count in window, ms until the window resets}
+_INCR_SCRIPT = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then redis.call('PEXPIRE', KEYS[1], ARGV[1]) end
+return {n, redis.call('PTTL', KEYS[1])}
+"""
+
+
+class RateLimitASGI:
+    """
+    Per-client-IP request limit (fixed window) as raw ASGI middleware.
+
+    Counts live in Redis, so the limit holds across workers and replicas.
+    Requests over the limit get a 429 with Retry-After / X-RateLimit-*
+    headers; everything else passes through untouched (no response
+    wrapping). The Redis client is read from `app.state.redis`, which the
+    lifespan sets; until then, or if Redis is unreachable, requests are
+    let through (fail open). The failure warning is logged at most once
+    per window so an outage doesn't emit one line per request.
+    """
+
+    def __init__(
+        self,
+        app,
+        limit: int = 100,
+        window_ms: int = 60_000,
+        exempt_paths: Iterable[str] = ("/api/health",),
+        key_prefix: str = "ratelimit:"
+    ):
+        self.app = app
+        self.limit = limit
+        self.window_ms = window_ms
+        self.exempt_paths = frozenset(exempt_paths)
+        self.key_prefix = key_prefix
+        self._script = None
+        self._script_client = None
+        self._last_warning = float("-inf")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        redis = getattr(scope["app"].state, "redis", None)
+        client = scope.get("client")
+        if redis is None or client is None:
+            await self.app(scope, receive, send)
+            return
+
+        # register_script() handles EVALSHA with an EVAL fallback (NOSCRIPT)
+        if self._script_client is not redis:
+            self._script = redis.register_script(_INCR_SCRIPT)
+            self._script_client = redis
+
+        try:
+            count, ttl_ms = await self._script(
+                keys=[self.key_prefix + client[0]],
+                args=[self.window_ms]
+            )
+        except Exception as e:
+            now = time.monotonic()
+            if (now - self._last_warning) * 1000 >= self.window_ms:
+                self._last_warning = now
+                logger.warning("Rate limit check failed, allowing requests: %s", e)
+            await self.app(scope, receive, send)
+            return
+
+        if count <= self.limit:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = str(max(1, -(-ttl_ms // 1000)))  # ceil to whole seconds
+        body = b'{"detail":"Rate limit exceeded"}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry_after.encode()),
+                (b"x-ratelimit-limit", str(self.limit).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+                (b"x-ratelimit-reset", retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -2,23 +2,33 @@
 Performance timing utilities for detailed metrics
 """
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from contextlib import contextmanager
 
 
 class StageTimer:
-    """Track timing for different processing stages"""
+    """
+    Track timing for different processing stages
+
+    Stage durations are kept as integer nanoseconds (perf_counter_ns) and
+    only converted to milliseconds in get_breakdown()/get_total_time().
+    Completed stages are appended as (name, ns) events; a stage that runs
+    more than once is summed in the breakdown rather than overwritten.
+    """
+
+    # One timer per request: no per-instance __dict__
+    __slots__ = ('_events', 'start_time', 'current_stage', 'current_stage_start')
 
     def __init__(self):
-        self.stages: Dict[str, float] = {}
-        self.start_time: Optional[float] = None
+        self._events: List[Tuple[str, int]] = []  # (stage name, elapsed ns)
+        self.start_time: Optional[int] = None
         self.current_stage: Optional[str] = None
-        self.current_stage_start: Optional[float] = None
+        self.current_stage_start: Optional[int] = None
 
     def start(self):
         """Start overall timing"""
-        self.start_time = time.time()
-        self.stages = {}
+        self.start_time = time.perf_counter_ns()
+        self._events = []
 
     def start_stage(self, stage_name: str):
         """Start timing a specific stage"""
@@ -27,21 +37,20 @@ class StageTimer:
             self.end_stage()
 
         self.current_stage = stage_name
-        self.current_stage_start = time.time()
+        self.current_stage_start = time.perf_counter_ns()
 
     def end_stage(self):
         """End current stage timing"""
-        if self.current_stage and self.current_stage_start:
-            elapsed = (time.time() - self.current_stage_start) * 1000  # ms
-            self.stages[self.current_stage] = elapsed
+        if self.current_stage and self.current_stage_start is not None:
+            self._events.append((self.current_stage, time.perf_counter_ns() - self.current_stage_start))
             self.current_stage = None
             self.current_stage_start = None
 
     def get_total_time(self) -> float:
         """Get total elapsed time in milliseconds"""
-        if not self.start_time:
+        if self.start_time is None:
             return 0.0
-        return (time.time() - self.start_time) * 1000
+        return (time.perf_counter_ns() - self.start_time) / 1e6
 
     def get_breakdown(self) -> Dict:
         """Get timing breakdown with percentages"""
@@ -58,8 +67,14 @@ class StageTimer:
                 "unaccounted_ms": 0
             }
 
+        # Single pass: sum repeated stages (first-seen order), then ns -> ms once each
+        stages_ns: Dict[str, int] = {}
+        for name, elapsed_ns in self._events:
+            stages_ns[name] = stages_ns.get(name, 0) + elapsed_ns
+        stages_ms = {name: elapsed_ns / 1e6 for name, elapsed_ns in stages_ns.items()}
+
         # Calculate unaccounted time
-        accounted_time = sum(self.stages.values())
+        accounted_time = sum(stages_ms.values())
         unaccounted_time = total_time - accounted_time
 
         # Build breakdown with percentages
@@ -70,7 +85,7 @@ class StageTimer:
                     "time_ms": round(time_ms, 2),
                     "percentage": round((time_ms / total_time) * 100, 1)
                 }
-                for name, time_ms in self.stages.items()
+                for name, time_ms in stages_ms.items()
             },
             "unaccounted_ms": round(unaccounted_time, 2),
             "unaccounted_percentage": round((unaccounted_time / total_time) * 100, 1)
@@ -99,11 +114,15 @@ def time_it(name: str = "operation"):
             # do work
             pass
         print(f"Took {timer['elapsed_ms']:.2f}ms")
+
+    The raw integer duration is also available as timer['elapsed_ns'].
     """
-    start = time.time()
-    result = {"elapsed_ms": 0}
+    start = time.perf_counter_ns()
+    result = {"elapsed_ms": 0, "elapsed_ns": 0}
 
     try:
         yield result
     finally:
-        result["elapsed_ms"] = (time.time() - start) * 1000
+        elapsed_ns = time.perf_counter_ns() - start
+        result["elapsed_ns"] = elapsed_ns
+        result["elapsed_ms"] = elapsed_ns / 1e6
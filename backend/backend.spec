@@ -45,7 +45,6 @@ hidden_imports = [
     'pydantic_core',
     'pydantic_settings',
     'python_multipart',
-    'slowapi',
 
     # LangChain Ecosystem (Core)
     'langchain',
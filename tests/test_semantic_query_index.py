@@ -0,0 +1,73 @@
+"""
+Unit tests for the in-process semantic query index (backend/app/core/query_index.py)
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Import the module directly: the backend package __init__ pulls in the full engine
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "app" / "core"))
+from query_index import SemanticQueryIndex, standalone_question  # noqa: E402
+
+
+def _embed(text: str) -> np.ndarray:
+    """Deterministic bag-of-words vector (stands in for the sentence encoder)"""
+    vector = np.zeros(512, dtype=np.float32)
+    for word in text.lower().replace("?", " ").replace(":", " ").split():
+        vector[zlib.crc32(word.encode()) % 512] += 1.0
+    return vector
+
+
+def _enhance(question: str, history: list) -> str:
+    """Shape of ConversationMemory's contextualized query: prior turns + question"""
+    context = " ".join(f"Previous question: {q} Previous answer: {a}" for q, a in history)
+    return f"{context} Current question: {question}"
+
+
+@pytest.mark.unit
+def test_follow_ups_in_one_conversation_do_not_collide():
+    index = SemanticQueryIndex(threshold=0.92)
+    history = [(
+        "What is the annual leave policy for active duty members?",
+        "Members accrue 2.5 days of annual leave per month, 30 days per fiscal year, "
+        "and may carry over up to 60 days into the next fiscal year."
+    )]
+
+    # Turn 1 is standalone: it is embedded and indexed as asked
+    first = history[0][0]
+    assert standalone_question(first, first) == first
+    index.add(_embed(first), first)
+
+    # Two different follow-ups: their enhanced texts are dominated by the shared
+    # context, close enough that indexing them would return one for the other
+    follow_up_a = "and for reservists?"
+    follow_up_b = "what about the second one?"
+    enhanced_a = _enhance(follow_up_a, history)
+    enhanced_b = _enhance(follow_up_b, history)
+    a, b = _embed(enhanced_a), _embed(enhanced_b)
+    assert float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b))) >= 0.92
+
+    # ...so neither takes part in the index (no lookup, nothing stored)
+    assert standalone_question(follow_up_a, enhanced_a) is None
+    assert standalone_question(follow_up_b, enhanced_b) is None
+
+    # Their raw text doesn't match each other or turn 1 either
+    index.add(_embed(follow_up_a), follow_up_a)
+    assert index.search(_embed(follow_up_b)) is None
+
+
+@pytest.mark.unit
+def test_paraphrase_of_standalone_question_hits():
+    index = SemanticQueryIndex(threshold=0.92)
+    question = "What is the annual leave policy?"
+    index.add(_embed(question), question)
+
+    assert index.search(_embed("what is the annual leave policy")) == question
+    assert index.search(_embed("What are the fitness test standards?")) is None
+
+    index.clear()
+    assert index.search(_embed(question)) is None